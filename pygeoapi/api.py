@@ -33,10 +33,13 @@ Returns content from plugins and sets reponses
 """
 
 from datetime import datetime
+from functools import lru_cache
+import hashlib
 import json
 import logging
 import os
 import re
+import time
 import urllib.parse
 
 from dateutil.parser import parse as dateparse
@@ -56,9 +59,9 @@ from pygeoapi.provider.tile import (ProviderTileNotFoundError,
                                     ProviderTileQueryError,
                                     ProviderTilesetIdNotFoundError)
 from pygeoapi.util import (dategetter, filter_dict_by_key_value,
-                           get_provider_by_type, get_provider_default,
-                           get_typed_value, render_j2_template, TEMPLATES,
-                           to_json)
+                           get_mimetype, get_provider_by_type,
+                           get_provider_default, get_typed_value,
+                           render_j2_template, TEMPLATES, to_json)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -69,7 +72,23 @@ HEADERS = {
 }
 
 #: Formats allowed for ?f= requests
-FORMATS = ['json', 'html', 'jsonld']
+FORMATS = frozenset(['json', 'html', 'jsonld'])
+
+#: Formats allowed for ?f= requests of collection items (includes formatters)
+ITEMS_FORMATS = FORMATS.union(f.lower() for f in PLUGINS['formatter'].keys())
+
+#: Formats negotiable from Accept header media types, in order of preference
+ACCEPT_FORMATS = (
+    ('text/html', 'html'),
+    ('application/ld+json', 'jsonld'),
+    ('application/json', 'json')
+)
+
+ACCEPT_PREFERENCE = {
+    mimetype: i for i, (mimetype, _) in enumerate(ACCEPT_FORMATS)
+}
+
+QVALUE_REGEX = re.compile(r'(?:^|;)\s*q\s*=\s*([^;\s]*)')
 
 CONFORMANCE = [
     'http://www.opengis.net/spec/ogcapi-features-1/1.0/conf/core',
@@ -85,6 +104,9 @@ CONFORMANCE = [
 
 OGC_RELTYPES_BASE = 'http://www.opengis.net/def/rel/ogc/1.0'
 
+#: Time (in seconds) for which tiles metadata is cached
+TILES_METADATA_CACHE_TTL = 600
+
 
 def pre_process(func):
     """
@@ -96,15 +118,9 @@ def pre_process(func):
         :returns: `func`
     """
 
-    def inner(*args, **kwargs):
-        cls = args[0]
-        headers_ = HEADERS.copy()
-        format_ = check_format(args[2], args[1])
-        if len(args) > 3:
-            args = args[3:]
-            return func(cls, headers_, format_, *args, **kwargs)
-        else:
-            return func(cls, headers_, format_)
+    def inner(cls, headers, args, *path_args, **kwargs):
+        return func(cls, HEADERS.copy(), check_format(args, headers),
+                    *path_args, **kwargs)
 
     return inner
 
@@ -132,38 +148,28 @@ class API:
 
         self.pretty_print = self.config['server']['pretty_print']
 
-        setup_logger(self.config['logging'])
+        self._tiles_metadata_cache = {}
+        self._landing_page_cache = {}
 
-    @pre_process
-    @jsonldify
-    def landing_page(self, headers_, format_):
-        """
-        Provide API
+        # conformance is static, so serialize it once
+        self._conformance_json = to_json({'conformsTo': CONFORMANCE},
+                                         self.pretty_print)
+        # and render it once, on first request
+        self._conformance_html = None
+        self._openapi_html = None
 
-        :param headers_: copy of HEADERS object
-        :param format_: format of requests, pre checked by
-                        pre_process decorator
+        setup_logger(self.config['logging'])
 
-        :returns: tuple of headers, status code, content
+    def _get_landing_page_links(self, format_):
         """
+        Generate landing page links
 
-        if format_ is not None and format_ not in FORMATS:
-            exception = {
-                'code': 'InvalidParameterValue',
-                'description': 'Invalid format'
-            }
-            LOGGER.error(exception)
-            return headers_, 400, to_json(exception, self.pretty_print)
+        :param format_: format of request
 
-        fcm = {
-            'links': [],
-            'title': self.config['metadata']['identification']['title'],
-            'description':
-                self.config['metadata']['identification']['description']
-        }
+        :returns: `list` of link `dict`s
+        """
 
-        LOGGER.debug('Creating links')
-        fcm['links'] = [{
+        return [{
               'rel': 'self' if not format_ or
               format_ == 'json' else 'alternate',
               'type': 'application/json',
@@ -204,9 +210,53 @@ class API:
             }
         ]
 
-        if format_ == 'html':  # render
-            headers_['Content-Type'] = 'text/html'
+    @pre_process
+    @jsonldify
+    def landing_page(self, headers_, format_):
+        """
+        Provide API
 
+        :param headers_: copy of HEADERS object
+        :param format_: format of requests, pre checked by
+                        pre_process decorator
+
+        :returns: tuple of headers, status code, content
+        """
+
+        if format_ is not None and format_ not in FORMATS:
+            exception = {
+                'code': 'InvalidParameterValue',
+                'description': 'Invalid format'
+            }
+            LOGGER.error(exception)
+            return headers_, 400, to_json(exception, self.pretty_print)
+
+        # the landing page only derives from configuration
+        if format_ not in self._landing_page_cache:
+            self._landing_page_cache[format_] = \
+                self._get_landing_page(format_)
+
+        headers_['Content-Type'], content = self._landing_page_cache[format_]
+
+        return headers_, 200, content
+
+    def _get_landing_page(self, format_):
+        """
+        Generate landing page
+
+        :param format_: format of request
+
+        :returns: tuple of content type, content
+        """
+
+        fcm = {
+            'links': self._get_landing_page_links(format_),
+            'title': self.config['metadata']['identification']['title'],
+            'description':
+                self.config['metadata']['identification']['description']
+        }
+
+        if format_ == 'html':  # render
             fcm['processes'] = False
             fcm['stac'] = False
 
@@ -219,13 +269,13 @@ class API:
                 fcm['stac'] = True
 
             content = render_j2_template(self.config, 'landing_page.html', fcm)
-            return headers_, 200, content
+            return 'text/html', content
 
         if format_ == 'jsonld':
-            headers_['Content-Type'] = 'application/ld+json'
-            return headers_, 200, to_json(self.fcmld, self.pretty_print)
+            return 'application/ld+json', to_json(self.fcmld,
+                                                  self.pretty_print)
 
-        return headers_, 200, to_json(fcm, self.pretty_print)
+        return HEADERS['Content-Type'], to_json(fcm, self.pretty_print)
 
     @pre_process
     def openapi(self, headers_, format_, openapi):
@@ -252,12 +302,15 @@ class API:
         path = '/'.join([self.config['server']['url'].rstrip('/'), 'openapi'])
 
         if format_ == 'html':
-            data = {
-                'openapi-document-path': path
-            }
+            if self._openapi_html is None:
+                data = {
+                    'openapi-document-path': path
+                }
+                self._openapi_html = render_j2_template(
+                    self.config, 'openapi.html', data)
+
             headers_['Content-Type'] = 'text/html'
-            content = render_j2_template(self.config, 'openapi.html', data)
-            return headers_, 200, content
+            return headers_, 200, self._openapi_html
 
         headers_['Content-Type'] = \
             'application/vnd.oai.openapi+json;version=3.0'
@@ -284,17 +337,18 @@ class API:
             LOGGER.error(exception)
             return headers_, 400, to_json(exception, self.pretty_print)
 
-        conformance = {
-            'conformsTo': CONFORMANCE
-        }
-
         if format_ == 'html':  # render
+            if self._conformance_html is None:
+                conformance = {
+                    'conformsTo': CONFORMANCE
+                }
+                self._conformance_html = render_j2_template(
+                    self.config, 'conformance.html', conformance)
+
             headers_['Content-Type'] = 'text/html'
-            content = render_j2_template(self.config, 'conformance.html',
-                                         conformance)
-            return headers_, 200, content
+            return headers_, 200, self._conformance_html
 
-        return headers_, 200, to_json(conformance, self.pretty_print)
+        return headers_, 200, self._conformance_json
 
     @pre_process
     @jsonldify
@@ -323,6 +377,8 @@ class API:
             'links': []
         }
 
+        server_url = self.config['server']['url']
+
         collections = filter_dict_by_key_value(self.config['resources'],
                                                'type', 'collection')
 
@@ -393,21 +449,21 @@ class API:
                 or format_ == 'json' else 'alternate',
                 'title': 'This document as JSON',
                 'href': '{}/collections/{}?f=json'.format(
-                    self.config['server']['url'], k)
+                    server_url, k)
             })
             collection['links'].append({
                 'type': 'application/ld+json',
                 'rel': 'self' if format_ == 'jsonld' else 'alternate',
                 'title': 'This document as RDF (JSON-LD)',
                 'href': '{}/collections/{}?f=jsonld'.format(
-                    self.config['server']['url'], k)
+                    server_url, k)
             })
             collection['links'].append({
                 'type': 'text/html',
                 'rel': 'self' if format_ == 'html' else 'alternate',
                 'title': 'This document as HTML',
                 'href': '{}/collections/{}?f=html'.format(
-                    self.config['server']['url'], k)
+                    server_url, k)
             })
 
             if collection_data_type == 'feature':
@@ -418,35 +474,35 @@ class API:
                     'rel': 'queryables',
                     'title': 'Queryables for this collection as JSON',
                     'href': '{}/collections/{}/queryables?f=json'.format(
-                        self.config['server']['url'], k)
+                        server_url, k)
                 })
                 collection['links'].append({
                     'type': 'text/html',
                     'rel': 'queryables',
                     'title': 'Queryables for this collection as HTML',
                     'href': '{}/collections/{}/queryables?f=html'.format(
-                        self.config['server']['url'], k)
+                        server_url, k)
                 })
                 collection['links'].append({
                     'type': 'application/geo+json',
                     'rel': 'items',
                     'title': 'items as GeoJSON',
                     'href': '{}/collections/{}/items?f=json'.format(
-                        self.config['server']['url'], k)
+                        server_url, k)
                 })
                 collection['links'].append({
                     'type': 'application/ld+json',
                     'rel': 'items',
                     'title': 'items as RDF (GeoJSON-LD)',
                     'href': '{}/collections/{}/items?f=jsonld'.format(
-                        self.config['server']['url'], k)
+                        server_url, k)
                 })
                 collection['links'].append({
                     'type': 'text/html',
                     'rel': 'items',
                     'title': 'Items as HTML',
                     'href': '{}/collections/{}/items?f=html'.format(
-                        self.config['server']['url'], k)
+                        server_url, k)
                 })
 
             elif collection_data_type == 'coverage':
@@ -456,17 +512,17 @@ class API:
                     'rel': 'collection',
                     'title': 'Detailed Coverage metadata in JSON',
                     'href': '{}/collections/{}?f=json'.format(
-                        self.config['server']['url'], k)
+                        server_url, k)
                 })
                 collection['links'].append({
                     'type': 'text/html',
                     'rel': 'collection',
                     'title': 'Detailed Coverage metadata in HTML',
                     'href': '{}/collections/{}?f=html'.format(
-                        self.config['server']['url'], k)
+                        server_url, k)
                 })
                 coverage_url = '{}/collections/{}/coverage'.format(
-                        self.config['server']['url'], k)
+                        server_url, k)
 
                 collection['links'].append({
                     'type': 'application/json',
@@ -497,7 +553,7 @@ class API:
                     'rel': '{}/coverage'.format(OGC_RELTYPES_BASE),
                     'title': 'Coverage data',
                     'href': '{}/collections/{}/coverage?f=json'.format(
-                        self.config['server']['url'], k)
+                        server_url, k)
                 })
                 if collection_data_format is not None:
                     collection['links'].append({
@@ -506,7 +562,7 @@ class API:
                         'title': 'Coverage data as {}'.format(
                             collection_data_format['name']),
                         'href': '{}/collections/{}/coverage?f={}'.format(
-                            self.config['server']['url'], k,
+                            server_url, k,
                             collection_data_format['name'])
                     })
                 if dataset is not None:
@@ -540,14 +596,14 @@ class API:
                     'rel': 'tiles',
                     'title': 'Tiles as JSON',
                     'href': '{}/collections/{}/tiles?f=json'.format(
-                        self.config['server']['url'], k)
+                        server_url, k)
                 })
                 collection['links'].append({
                     'type': 'text/html',
                     'rel': 'tiles',
                     'title': 'Tiles as HTML',
                     'href': '{}/collections/{}/tiles?f=html'.format(
-                        self.config['server']['url'], k)
+                        server_url, k)
                 })
 
             if dataset is not None and k == dataset:
@@ -563,21 +619,21 @@ class API:
                 or format_ == 'json' else 'alternate',
                 'title': 'This document as JSON',
                 'href': '{}/collections?f=json'.format(
-                    self.config['server']['url'])
+                    server_url)
             })
             fcm['links'].append({
                 'type': 'application/ld+json',
                 'rel': 'self' if format_ == 'jsonld' else 'alternate',
                 'title': 'This document as RDF (JSON-LD)',
                 'href': '{}/collections?f=jsonld'.format(
-                    self.config['server']['url'])
+                    server_url)
             })
             fcm['links'].append({
                 'type': 'text/html',
                 'rel': 'self' if format_ == 'html' else 'alternate',
                 'title': 'This document as HTML',
                 'href': '{}/collections?f=html'.format(
-                    self.config['server']['url'])
+                    server_url)
             })
 
         if format_ == 'html':  # render
@@ -706,8 +762,6 @@ class API:
         properties = []
         reserved_fieldnames = ['bbox', 'f', 'limit', 'startindex',
                                'resulttype', 'datetime', 'sortby']
-        formats = FORMATS
-        formats.extend(f.lower() for f in PLUGINS['formatter'].keys())
 
         collections = filter_dict_by_key_value(self.config['resources'],
                                                'type', 'collection')
@@ -722,7 +776,7 @@ class API:
 
         format_ = check_format(args, headers)
 
-        if format_ is not None and format_ not in formats:
+        if format_ is not None and format_ not in ITEMS_FORMATS:
             exception = {
                 'code': 'InvalidParameterValue',
                 'description': 'Invalid format'
@@ -1656,7 +1710,19 @@ tiles/{{{}}}/{{{}}}/{{{}}}/{{{}}}?f=mvt'
                 LOGGER.error(exception)
                 return headers_, 404, to_json(exception)
             else:
-                return headers_, 202, content
+                # the ETag derives from the tile itself, as providers
+                # (e.g. remote tile services) expose no modification time;
+                # a 304 saves the transfer, not the provider fetch
+                headers_['ETag'] = '"{}"'.format(
+                    hashlib.blake2b(content, digest_size=16).hexdigest())
+                etags = _get_etags(headers)
+                # any existing representation matches If-None-Match: *
+                if '*' in etags or headers_['ETag'] in etags:
+                    LOGGER.debug('Tile not modified')
+                    return headers_, 304, b''
+                # 200 (not 202), so that clients cache the tile and
+                # revalidate it with If-None-Match
+                return headers_, 200, content
         # @TODO: figure out if the spec requires to return json errors
         except KeyError:
             exception = {
@@ -1735,48 +1801,59 @@ tiles/{{{}}}/{{{}}}/{{{}}}/{{{}}}?f=mvt'
             LOGGER.error(exception)
             return headers_, 400, to_json(exception, self.pretty_print)
 
-        LOGGER.debug('Creating collection tiles')
-        LOGGER.debug('Loading provider')
-        try:
-            t = get_provider_by_type(
-                self.config['resources'][dataset]['providers'], 'tile')
-            p = load_plugin('provider', t)
-        except KeyError:
-            exception = {
-                'code': 'InvalidParameterValue',
-                'description': 'Invalid collection tiles'
-            }
-            LOGGER.error(exception)
-            return headers_, 400, to_json(exception, self.pretty_print)
-        except ProviderConnectionError:
-            exception = {
-                'code': 'NoApplicableCode',
-                'description': 'connection error (check logs)'
-            }
-            LOGGER.error(exception)
-            return headers_, 500, to_json(exception, self.pretty_print)
-        except ProviderQueryError:
-            exception = {
-                'code': 'NoApplicableCode',
-                'description': 'query error (check logs)'
-            }
-            LOGGER.error(exception)
-            return headers_, 500, to_json(exception, self.pretty_print)
+        cache_key = (dataset, matrix_id)
+        cached = self._tiles_metadata_cache.get(cache_key)
 
-        if matrix_id not in p.options['schemes']:
-            exception = {
-                'code': 'NotFound',
-                'description': 'tileset not found'
-            }
-            LOGGER.error(exception)
-            return headers_, 404, to_json(exception, self.pretty_print)
+        if cached is not None and cached[0] > time.monotonic():
+            LOGGER.debug('Using cached collection tiles metadata')
+            metadata_format, tiles_metadata = cached[1:]
+        else:
+            LOGGER.debug('Creating collection tiles')
+            LOGGER.debug('Loading provider')
+            try:
+                t = get_provider_by_type(
+                    self.config['resources'][dataset]['providers'], 'tile')
+                p = load_plugin('provider', t)
+            except KeyError:
+                exception = {
+                    'code': 'InvalidParameterValue',
+                    'description': 'Invalid collection tiles'
+                }
+                LOGGER.error(exception)
+                return headers_, 400, to_json(exception, self.pretty_print)
+            except ProviderConnectionError:
+                exception = {
+                    'code': 'NoApplicableCode',
+                    'description': 'connection error (check logs)'
+                }
+                LOGGER.error(exception)
+                return headers_, 500, to_json(exception, self.pretty_print)
+            except ProviderQueryError:
+                exception = {
+                    'code': 'NoApplicableCode',
+                    'description': 'query error (check logs)'
+                }
+                LOGGER.error(exception)
+                return headers_, 500, to_json(exception, self.pretty_print)
 
-        metadata_format = p.options['metadata_format']
-        tilejson = True if (metadata_format == 'tilejson') else False
+            if matrix_id not in p.options['schemes']:
+                exception = {
+                    'code': 'NotFound',
+                    'description': 'tileset not found'
+                }
+                LOGGER.error(exception)
+                return headers_, 404, to_json(exception, self.pretty_print)
 
-        tiles_metadata = p.get_metadata(
-            dataset=dataset, server_url=self.config['server']['url'],
-            layer=p.get_layer(), tileset=matrix_id, tilejson=tilejson)
+            metadata_format = p.options['metadata_format']
+            tilejson = True if (metadata_format == 'tilejson') else False
+
+            tiles_metadata = p.get_metadata(
+                dataset=dataset, server_url=self.config['server']['url'],
+                layer=p.get_layer(), tileset=matrix_id, tilejson=tilejson)
+
+            self._tiles_metadata_cache[cache_key] = (
+                time.monotonic() + TILES_METADATA_CACHE_TTL,
+                metadata_format, tiles_metadata)
 
         if format_ == 'html':  # render
             metadata = dict(metadata=tiles_metadata)
@@ -2071,7 +2148,8 @@ tiles/{{{}}}/{{{}}}/{{{}}}/{{{}}}?f=mvt'
             return headers_, 200, to_json(content, self.pretty_print)
 
         else:  # send back file
-            headers_.pop('Content-Type', None)
+            headers_['Content-Type'] = (get_mimetype(path) or
+                                        'application/octet-stream')
             return headers_, 200, stac_data
 
 
@@ -2093,26 +2171,80 @@ def check_format(args, headers):
 
     # Format not specified: get from accept headers
     # format_ = 'text/html'
-    headers_ = None
-    if 'accept' in headers.keys():
-        headers_ = headers['accept']
-    elif 'Accept' in headers.keys():
-        headers_ = headers['Accept']
+    # Flask and Starlette headers are case-insensitive, plain dicts are not
+    headers_ = headers.get('accept')
+    if headers_ is None:
+        headers_ = headers.get('Accept')
 
     format_ = None
     if headers_:
-        headers_ = headers_.split(',')
-
-        if 'text/html' in headers_:
-            format_ = 'html'
-        elif 'application/ld+json' in headers_:
-            format_ = 'jsonld'
-        elif 'application/json' in headers_:
-            format_ = 'json'
+        format_ = _get_format_from_accept(headers_)
 
     return format_
 
 
+@lru_cache(maxsize=512)
+def _get_format_from_accept(accept):
+    """
+    derive format from the value of an Accept header, by quality value
+    and then by order of preference of ACCEPT_FORMATS
+
+    Clients tend to send the same handful of Accept header values, so
+    results are cached on the raw header string.
+
+    :param accept: `str` of Accept header value
+
+    :returns: format value
+    """
+
+    # (negated quality value, preference) of each acceptable format
+    candidates = []
+
+    for media_range in accept.split(','):
+        mimetype, _, params = media_range.partition(';')
+        preference = ACCEPT_PREFERENCE.get(mimetype.strip())
+        if preference is None:
+            continue
+
+        qvalue = 1.0
+        match = QVALUE_REGEX.search(params)
+        if match is not None:
+            try:
+                qvalue = float(match.group(1))
+            except ValueError:
+                LOGGER.debug('Invalid quality value: {}'.format(media_range))
+
+        if qvalue > 0:
+            candidates.append((-qvalue, preference))
+
+    if not candidates:
+        return None
+
+    return ACCEPT_FORMATS[min(candidates)[1]][1]
+
+
+def _get_etags(headers):
+    """
+    get entity tags of the If-None-Match request header, compared weakly
+    (i.e. without any W/ prefix) as per RFC 7232
+
+    :param headers: dict of request headers
+
+    :returns: `list` of entity tags
+    """
+
+    # Flask and Starlette headers are case-insensitive, plain dicts are not
+    if_none_match = headers.get('if-none-match')
+    if if_none_match is None:
+        if_none_match = headers.get('If-None-Match')
+
+    if not if_none_match:
+        return []
+
+    return [etag.strip()[2:] if etag.strip().startswith('W/')
+            else etag.strip() for etag in if_none_match.split(',')]
+
+
 def validate_bbox(value=None):
     """
     Helper function to validate bbox parameter
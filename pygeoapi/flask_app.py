@@ -34,9 +34,10 @@ import os
 
 import click
 
-from flask import Flask, Blueprint, make_response, request, send_from_directory
+from flask import Flask, Blueprint, request, send_from_directory
 
 from pygeoapi.api import API
+from pygeoapi.openapi import load_openapi_document
 from pygeoapi.util import get_mimetype, yaml_load
 
 
@@ -62,8 +63,31 @@ if CONFIG['server'].get('cors', False):
     from flask_cors import CORS
     CORS(APP)
 
+# Caching: optionally enable from config.
+CACHE = None
+if CONFIG['server'].get('cache', False):
+    from flask_caching import Cache
+    CACHE = Cache(APP, config={
+        'CACHE_TYPE': 'SimpleCache',
+        'CACHE_DEFAULT_TIMEOUT': 300
+    })
+
+# Compression: optionally enable from config.
+if CONFIG['server'].get('compress', False):
+    from flask_compress import Compress
+    APP.config['COMPRESS_MIMETYPES'] = [
+        'application/json',
+        'application/geo+json',
+        'application/ld+json',
+        'application/vnd.oai.openapi+json',
+        'text/html'
+    ]
+    APP.config['COMPRESS_LEVEL'] = 5
+    APP.config['COMPRESS_MIN_SIZE'] = 500
+    Compress(APP)
+
 APP.config['JSONIFY_PRETTYPRINT_REGULAR'] = CONFIG['server'].get(
-    'pretty_print', True)
+    'pretty_print', False)
 
 api_ = API(CONFIG)
 
@@ -86,297 +110,147 @@ if (OGC_SCHEMAS_LOCATION is not None and
         :returns: HTTP response
         """
 
-        full_filepath = os.path.join(OGC_SCHEMAS_LOCATION, path)
-        dirname_ = os.path.dirname(full_filepath)
-        basename_ = os.path.basename(full_filepath)
-
-        # TODO: better sanitization?
-        path_ = dirname_.replace('..', '').replace('//', '')
-        return send_from_directory(path_, basename_,
-                                   mimetype=get_mimetype(basename_))
-
-
-@BLUEPRINT.route('/')
-def landing_page():
-    """
-    OGC API landing page endpoint
-
-    :returns: HTTP response
-    """
-    headers, status_code, content = api_.landing_page(
-        request.headers, request.args)
-
-    response = make_response(content, status_code)
-
-    if headers:
-        response.headers = headers
-
-    return response
-
-
-@BLUEPRINT.route('/openapi')
-def openapi():
-    """
-    OpenAPI endpoint
-
-    :returns: HTTP response
-    """
-    with open(os.environ.get('PYGEOAPI_OPENAPI'), encoding='utf8') as ff:
-        openapi = yaml_load(ff)
-
-    headers, status_code, content = api_.openapi(request.headers, request.args,
-                                                 openapi)
-
-    response = make_response(content, status_code)
-
-    if headers:
-        response.headers = headers
-
-    return response
-
-
-@BLUEPRINT.route('/conformance')
-def conformance():
-    """
-    OGC API conformance endpoint
-
-    :returns: HTTP response
-    """
-
-    headers, status_code, content = api_.conformance(request.headers,
-                                                     request.args)
-
-    response = make_response(content, status_code)
-
-    if headers:
-        response.headers = headers
-
-    return response
-
-
-@BLUEPRINT.route('/collections')
-@BLUEPRINT.route('/collections/<collection_id>')
-def collections(collection_id=None):
-    """
-    OGC API collections endpoint
-
-    :param collection_id: collection identifier
-
-    :returns: HTTP response
-    """
-
-    headers, status_code, content = api_.describe_collections(
-        request.headers, request.args, collection_id)
-
-    response = make_response(content, status_code)
-
-    if headers:
-        response.headers = headers
-
-    return response
-
-
-@BLUEPRINT.route('/collections/<collection_id>/queryables')
-def collection_queryables(collection_id=None):
-    """
-    OGC API collections querybles endpoint
-
-    :param collection_id: collection identifier
-
-    :returns: HTTP response
-    """
-
-    headers, status_code, content = api_.get_collection_queryables(
-        request.headers, request.args, collection_id)
-
-    response = make_response(content, status_code)
-
-    if headers:
-        response.headers = headers
-
-    return response
-
-
-@BLUEPRINT.route('/collections/<collection_id>/items')
-@BLUEPRINT.route('/collections/<collection_id>/items/<item_id>')
-def collection_items(collection_id, item_id=None):
-    """
-    OGC API collections items endpoint
-
-    :param collection_id: collection identifier
-    :param item_id: item identifier
-
-    :returns: HTTP response
-    """
-
-    if item_id is None:
-        headers, status_code, content = api_.get_collection_items(
-            request.headers, request.args, collection_id)
-    else:
-        headers, status_code, content = api_.get_collection_item(
-            request.headers, request.args, collection_id, item_id)
-
-    response = make_response(content, status_code)
-
-    if headers:
-        response.headers = headers
-
-    return response
-
-
-@BLUEPRINT.route('/collections/<collection_id>/coverage')
-def collection_coverage(collection_id):
-    """
-    OGC API - Coverages coverage endpoint
+        # send_from_directory safely joins path onto the schemas root,
+        # returning 404 for anything resolving outside of it
+        return send_from_directory(OGC_SCHEMAS_LOCATION, path,
+                                   mimetype=get_mimetype(path))
 
-    :param collection_id: collection identifier
 
-    :returns: HTTP response
+def get_response(result):
     """
+    Creates a Flask Response object with matching headers.
 
-    headers, status_code, content = api_.get_collection_coverage(
-        request.headers, request.args, collection_id)
-
-    response = make_response(content, status_code)
-
-    if headers:
-        response.headers = headers
-
-    return response
+    Content which is not `str` or `bytes` (e.g. a generator of raw file
+    chunks) is streamed to the client as it is produced rather than
+    buffered in memory.
 
+    :param result: The result of the API call.
+                   This should be a tuple of (headers, status, content).
 
-@BLUEPRINT.route('/collections/<collection_id>/coverage/domainset')
-def collection_coverage_domainset(collection_id):
-    """
-    OGC API - Coverages coverage domainset endpoint
-
-    :param collection_id: collection identifier
-
-    :returns: HTTP response
+    :returns: A Response instance.
     """
 
-    headers, status_code, content = api_.get_collection_coverage_domainset(
-        request.headers, request.args, collection_id)
+    headers, status_code, content = result
 
-    response = make_response(content, status_code)
+    return APP.response_class(
+        content, status=status_code, headers=headers or None,
+        direct_passthrough=not isinstance(content, (str, bytes)))
 
-    if headers:
-        response.headers = headers
 
-    return response
-
-
-@BLUEPRINT.route('/collections/<collection_id>/coverage/rangetype')
-def collection_coverage_rangetype(collection_id):
+def _cache_key(*args, **kwargs):
     """
-    OGC API - Coverages coverage rangetype endpoint
+    Derives the response cache key of a request
 
-    :param collection_id: collection identifier
+    Responses are negotiated on both the f parameter and the Accept header,
+    so both form part of the key.
 
-    :returns: HTTP response
+    :returns: `str` of cache key
     """
 
-    headers, status_code, content = api_.get_collection_coverage_rangetype(
-        request.headers, request.args, collection_id)
-
-    response = make_response(content, status_code)
+    return '{}?{}|{}'.format(request.path,
+                             request.query_string.decode('utf-8'),
+                             request.headers.get('Accept', ''))
 
-    if headers:
-        response.headers = headers
 
-    return response
-
-
-@BLUEPRINT.route('/collections/<collection_id>/tiles')
-def get_collection_tiles(collection_id=None):
+def cached(view):
     """
-    OGC open api collections tiles access point
+    Caches the successful responses of a view when caching is enabled in
+    config.  Only to be used on views whose responses derive (mostly) from
+    configuration; error responses are never cached, so that transient
+    provider errors are not served after the backend recovers.
 
-    :param collection_id: collection identifier
+    :param view: view function
 
-    :returns: HTTP response
+    :returns: view function
     """
 
-    headers, status_code, content = api_.get_collection_tiles(
-        request.headers, request.args, collection_id)
+    if CACHE is None:
+        return view
 
-    response = make_response(content, status_code)
+    return CACHE.cached(make_cache_key=_cache_key,
+                        response_filter=lambda r: r.status_code == 200)(view)
 
-    if headers:
-        response.headers = headers
 
-    return response
+# OGC API endpoints which map directly onto a single API method:
+# (URL rules, endpoint / API method name, URL variables passed positionally)
+ROUTES = [
+    (('/',), 'landing_page', ()),
+    (('/conformance',), 'conformance', ()),
+    (('/collections', '/collections/<collection_id>'),
+     'describe_collections', ('collection_id',)),
+    (('/collections/<collection_id>/queryables',),
+     'get_collection_queryables', ('collection_id',)),
+    (('/collections/<collection_id>/items',),
+     'get_collection_items', ('collection_id',)),
+    (('/collections/<collection_id>/items/<item_id>',),
+     'get_collection_item', ('collection_id', 'item_id')),
+    (('/collections/<collection_id>/coverage',),
+     'get_collection_coverage', ('collection_id',)),
+    (('/collections/<collection_id>/coverage/domainset',),
+     'get_collection_coverage_domainset', ('collection_id',)),
+    (('/collections/<collection_id>/coverage/rangetype',),
+     'get_collection_coverage_rangetype', ('collection_id',)),
+    (('/collections/<collection_id>/tiles',),
+     'get_collection_tiles', ('collection_id',)),
+    (('/collections/<collection_id>/tiles/<tileMatrixSetId>/metadata',),
+     'get_collection_tiles_metadata', ('collection_id', 'tileMatrixSetId')),
+    (('/collections/<collection_id>/tiles/<tileMatrixSetId>/<tileMatrix>/'
+      '<tileRow>/<tileCol>',),
+     'get_collection_tiles_data',
+     ('collection_id', 'tileMatrixSetId', 'tileMatrix', 'tileRow',
+      'tileCol')),
+    (('/processes', '/processes/<process_id>'),
+     'describe_processes', ('process_id',)),
+    (('/stac',), 'get_stac_root', ()),
+    (('/stac/<path:path>',), 'get_stac_path', ('path',))
+]
 
+# API methods whose responses derive (mostly) from configuration
+CACHED_METHODS = ('landing_page', 'conformance', 'describe_collections')
 
-@BLUEPRINT.route('/collections/<collection_id>/tiles/<tileMatrixSetId>/metadata')  # noqa
-def get_collection_tiles_metadata(collection_id=None, tileMatrixSetId=None):
-    """
-    OGC open api collection tiles service metadata
 
-    :param collection_id: collection identifier
-    :param tileMatrixSetId: identifier of tile matrix set
-
-    :returns: HTTP response
+def _make_view(method_name, url_variables):
     """
+    Creates a view function dispatching to a single API method
 
-    headers, status_code, content = api_.get_collection_tiles_metadata(
-        request.headers, request.args, collection_id, tileMatrixSetId)
-
-    response = make_response(content, status_code)
-
-    if headers:
-        response.headers = headers
+    :param method_name: name of `pygeoapi.api.API` method
+    :param url_variables: `tuple` of URL variable names, passed to the
+                          API method in order after headers and args
 
-    return response
-
-
-@BLUEPRINT.route('/collections/<collection_id>/tiles/\
-<tileMatrixSetId>/<tileMatrix>/<tileRow>/<tileCol>')
-def get_collection_tiles_data(collection_id=None, tileMatrixSetId=None,
-                              tileMatrix=None, tileRow=None, tileCol=None):
+    :returns: view function
     """
-    OGC open api collection tiles service data
 
-    :param collection_id: collection identifier
-    :param tileMatrixSetId: identifier of tile matrix set
-    :param tileMatrix: identifier of {z} matrix index
-    :param tileRow: identifier of {y} matrix index
-    :param tileCol: identifier of {x} matrix index
+    api_method = getattr(api_, method_name)
 
-    :returns: HTTP response
-    """
+    def view(**kwargs):
+        return get_response(api_method(
+            request.headers, request.args,
+            *[kwargs.get(v) for v in url_variables]))
 
-    headers, status_code, content = api_.get_collection_tiles_data(
-        request.headers, request.args, collection_id,
-        tileMatrixSetId, tileMatrix, tileRow, tileCol)
+    view.__name__ = method_name
 
-    response = make_response(content, status_code)
+    return view
 
-    if headers:
-        response.headers = headers
 
-    return response
+for rules, method_name, url_variables in ROUTES:
+    view_ = _make_view(method_name, url_variables)
+    if method_name in CACHED_METHODS:
+        view_ = cached(view_)
+    for rule in rules:
+        BLUEPRINT.add_url_rule(rule, method_name, view_)
 
 
-@BLUEPRINT.route('/processes')
-@BLUEPRINT.route('/processes/<process_id>')
-def processes(process_id=None):
+# not response cached: the OpenAPI document is reloaded when modified
+@BLUEPRINT.route('/openapi')
+def openapi():
     """
-    OGC API - Processes description endpoint
-
-    :param process_id: process identifier
+    OpenAPI endpoint
 
     :returns: HTTP response
     """
-    headers, status_code, content = api_.describe_processes(
-        request.headers, request.args, process_id)
-
-    response = make_response(content, status_code)
-
-    if headers:
-        response.headers = headers
+    openapi = load_openapi_document(os.environ.get('PYGEOAPI_OPENAPI'))
 
-    return response
+    return get_response(api_.openapi(request.headers, request.args, openapi))
 
 
 @BLUEPRINT.route('/processes/<process_id>/jobs', methods=['GET', 'POST'])
@@ -389,58 +263,13 @@ def process_jobs(process_id=None):
     :returns: HTTP response
     """
 
-    if request.method == 'GET':
-        headers, status_code, content = ({}, 200, "[]")
-    elif request.method == 'POST':
-        headers, status_code, content = api_.execute_process(
-            request.headers, request.args, request.data, process_id)
-
-    response = make_response(content, status_code)
-
-    if headers:
-        response.headers = headers
-
-    return response
-
-
-@BLUEPRINT.route('/stac')
-def stac_catalog_root():
-    """
-    STAC root endpoint
-
-    :returns: HTTP response
-    """
-
-    headers, status_code, content = api_.get_stac_root(
-        request.headers, request.args)
-
-    response = make_response(content, status_code)
-
-    if headers:
-        response.headers = headers
-
-    return response
-
-
-@BLUEPRINT.route('/stac/<path:path>')
-def stac_catalog_path(path):
-    """
-    STAC path endpoint
-
-    :param path: path
-
-    :returns: HTTP response
-    """
-
-    headers, status_code, content = api_.get_stac_path(
-        request.headers, request.args, path)
-
-    response = make_response(content, status_code)
-
-    if headers:
-        response.headers = headers
+    method = request.method
 
-    return response
+    if method == 'GET':
+        return get_response(({}, 200, "[]"))
+    elif method == 'POST':
+        return get_response(api_.execute_process(
+            request.headers, request.args, request.data, process_id))
 
 
 APP.register_blueprint(BLUEPRINT)
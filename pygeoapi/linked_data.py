@@ -30,10 +30,9 @@
 Returns content as linked data representations
 """
 
-import json
 import logging
 
-from pygeoapi.util import is_url
+from pygeoapi.util import is_url, to_json
 
 LOGGER = logging.getLogger(__name__)
 
@@ -52,51 +51,53 @@ def jsonldify(func):
         format_ = args[2]
         if not format_ == 'jsonld':
             return func(*args, **kwargs)
-        LOGGER.debug('Creating JSON-LD representation')
         cls = args[0]
-        cfg = cls.config
-        meta = cfg.get('metadata', {})
-        contact = meta.get('contact', {})
-        provider = meta.get('provider', {})
-        ident = meta.get('identification', {})
-        fcmld = {
-          "@context": "https://schema.org/docs/jsonldcontext.jsonld",
-          "@type": "DataCatalog",
-          "@id": cfg.get('server', {}).get('url', None),
-          "url": cfg.get('server', {}).get('url', None),
-          "name": ident.get('title', None),
-          "description": ident.get('description', None),
-          "keywords": ident.get('keywords', None),
-          "termsOfService": ident.get('terms_of_service', None),
-          "license": meta.get('license', {}).get('url', None),
-          "provider": {
-            "@type": "Organization",
-            "name": provider.get('name', None),
-            "url": provider.get('url', None),
-            "address": {
-                "@type": "PostalAddress",
-                "streetAddress": contact.get('address', None),
-                "postalCode": contact.get('postalcode', None),
-                "addressLocality": contact.get('city', None),
-                "addressRegion": contact.get('stateorprovince', None),
-                "addressCountry": contact.get('country', None)
-            },
-            "contactPoint": {
-                "@type": "Contactpoint",
-                "email": contact.get('email', None),
-                "telephone": contact.get('phone', None),
-                "faxNumber": contact.get('fax', None),
-                "url": contact.get('url', None),
-                "hoursAvailable": {
-                    "opens": contact.get('hours', None),
-                    "description": contact.get('instructions', None)
+        # configuration does not change, so only build this once
+        if getattr(cls, 'fcmld', None) is None:
+            LOGGER.debug('Creating JSON-LD representation')
+            cfg = cls.config
+            meta = cfg.get('metadata', {})
+            contact = meta.get('contact', {})
+            provider = meta.get('provider', {})
+            ident = meta.get('identification', {})
+            fcmld = {
+              "@context": "https://schema.org/docs/jsonldcontext.jsonld",
+              "@type": "DataCatalog",
+              "@id": cfg.get('server', {}).get('url', None),
+              "url": cfg.get('server', {}).get('url', None),
+              "name": ident.get('title', None),
+              "description": ident.get('description', None),
+              "keywords": ident.get('keywords', None),
+              "termsOfService": ident.get('terms_of_service', None),
+              "license": meta.get('license', {}).get('url', None),
+              "provider": {
+                "@type": "Organization",
+                "name": provider.get('name', None),
+                "url": provider.get('url', None),
+                "address": {
+                    "@type": "PostalAddress",
+                    "streetAddress": contact.get('address', None),
+                    "postalCode": contact.get('postalcode', None),
+                    "addressLocality": contact.get('city', None),
+                    "addressRegion": contact.get('stateorprovince', None),
+                    "addressCountry": contact.get('country', None)
                 },
-                "contactType": contact.get('role', None),
-                "description": contact.get('position', None)
+                "contactPoint": {
+                    "@type": "Contactpoint",
+                    "email": contact.get('email', None),
+                    "telephone": contact.get('phone', None),
+                    "faxNumber": contact.get('fax', None),
+                    "url": contact.get('url', None),
+                    "hoursAvailable": {
+                        "opens": contact.get('hours', None),
+                        "description": contact.get('instructions', None)
+                    },
+                    "contactType": contact.get('role', None),
+                    "description": contact.get('position', None)
+                }
+              }
             }
-          }
-        }
-        cls.fcmld = fcmld
+            cls.fcmld = fcmld
         return func(cls, *args[1:], **kwargs)
     return inner
 
@@ -202,4 +203,4 @@ def geojson2geojsonld(config, data, dataset, identifier=None):
             else:
                 feature['id'] = '{}/{}'.format(data['id'], featureId)
 
-    return json.dumps(ldjsonData)
+    return to_json(ldjsonData)
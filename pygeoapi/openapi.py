@@ -28,6 +28,7 @@
 # =================================================================
 
 from copy import deepcopy
+from functools import lru_cache
 import logging
 import os
 
@@ -833,6 +834,35 @@ def get_oas(cfg, version='3.0'):
         raise RuntimeError('OpenAPI version not supported')
 
 
+def load_openapi_document(filepath):
+    """
+    Load an OpenAPI Document from disk.  The document is parsed once and
+    reused for subsequent calls until the file is modified; the returned
+    `dict` must therefore not be modified by callers.
+
+    :param filepath: path to OpenAPI Document (YAML or JSON)
+
+    :returns: OpenAPI definition `dict`
+    """
+
+    return _load_openapi_document(filepath, os.stat(filepath).st_mtime)
+
+
+@lru_cache(maxsize=4)
+def _load_openapi_document(filepath, mtime):
+    """
+    Helper function to load (and cache) an OpenAPI Document
+
+    :param filepath: path to OpenAPI Document (YAML or JSON)
+    :param mtime: modification time of filepath, as cache key
+
+    :returns: OpenAPI definition `dict`
+    """
+
+    with open(filepath, encoding='utf8') as ff:
+        return yaml_load(ff)
+
+
 @click.command('generate-openapi-document')
 @click.pass_context
 @click.option('--config', '-c', 'config_file', help='configuration file')
@@ -37,6 +37,9 @@ from pygeoapi.provider.base import (BaseProvider, ProviderConnectionError,
 
 LOGGER = logging.getLogger(__name__)
 
+#: Size (in bytes) of chunks used when streaming raw files
+CHUNK_SIZE = 65536
+
 
 class FileSystemProvider(BaseProvider):
     """filesystem Provider"""
@@ -65,7 +68,8 @@ class FileSystemProvider(BaseProvider):
         :param urlpath: base path of URL
         :param dirpath: directory basepath (equivalent of URL)
 
-        :returns: `dict` of file listing or `dict` of GeoJSON item or raw file
+        :returns: `dict` of file listing or `dict` of GeoJSON item or
+                  generator of raw file chunks
         """
 
         thispath = os.path.join(baseurl, urlpath)
@@ -136,8 +140,20 @@ class FileSystemProvider(BaseProvider):
             raise ProviderNotFoundError(msg)
 
         if resource_type == 'raw_file':
-            with io.open(data_path, 'rb') as fh:
-                return fh.read()
+            # open eagerly, so that errors are raised here rather than
+            # once the response is already being streamed
+            try:
+                fh = io.open(data_path, 'rb')
+            except FileNotFoundError:
+                msg = 'Resource does not exist: {}'.format(data_path)
+                LOGGER.error(msg)
+                raise ProviderNotFoundError(msg)
+            except OSError as err:
+                msg = 'Cannot read resource: {}'.format(err)
+                LOGGER.error(msg)
+                raise ProviderConnectionError(msg)
+
+            return _read_file_chunks(fh)
 
         elif resource_type == 'directory':
             dirpath2 = os.listdir(data_path)
@@ -204,6 +220,21 @@ class FileSystemProvider(BaseProvider):
         return '<FileSystemProvider> {}'.format(self.data)
 
 
+def _read_file_chunks(fh):
+    """
+    Helper function to read a raw file in chunks, so that large files
+    can be streamed back to the client without being loaded into memory
+
+    :param fh: file object opened in binary mode, closed once read
+
+    :returns: generator of `bytes` chunks
+    """
+
+    with fh:
+        for chunk in iter(lambda: fh.read(CHUNK_SIZE), b''):
+            yield chunk
+
+
 def _describe_file(filepath):
     """
     Helper function to describe a geospatial data
@@ -30,6 +30,7 @@
 import json
 import logging
 import requests
+import threading
 from pathlib import Path
 from urllib.parse import urlparse, urljoin
 
@@ -41,6 +42,26 @@ from pygeoapi.provider.base import ProviderConnectionError
 
 LOGGER = logging.getLogger(__name__)
 
+# HTTP sessions of MVT providers, one per thread: requests.Session is not
+# guaranteed to be thread-safe, while API calls run in a threadpool
+SESSIONS = threading.local()
+
+
+def get_session():
+    """
+    Helper function to get the HTTP session of the current thread, so that
+    connections to upstream tile services are reused across requests
+
+    :returns: `requests.Session`
+    """
+
+    session = getattr(SESSIONS, 'session', None)
+    if session is None:
+        session = requests.Session()
+        SESSIONS.session = session
+
+    return session
+
 
 class MVTProvider(BaseTileProvider):
     """MVT Provider"""
@@ -191,13 +212,10 @@ class MVTProvider(BaseTileProvider):
         if is_url(self.data):
             url = urlparse(self.data)
             base_url = '{}://{}'.format(url.scheme, url.netloc)
-            with requests.Session() as session:
-                session.get(base_url)
-                resp = session.get('{base_url}/{lyr}/{z}/{y}/{x}.{f}'.format(
-                    base_url=base_url, lyr=layer,
-                    z=z, y=y, x=x, f=format_))
-                resp.raise_for_status()
-                return resp.content
+            resp = get_session().get('{base_url}/{lyr}/{z}/{y}/{x}.{f}'.format(
+                base_url=base_url, lyr=layer, z=z, y=y, x=x, f=format_))
+            resp.raise_for_status()
+            return resp.content
         else:
             if not isinstance(self.service_url, Path):
                 msg = 'Wrong data path configuration: {}'.format(
@@ -232,11 +250,9 @@ class MVTProvider(BaseTileProvider):
         if is_url(self.data):
             url = urlparse(self.data)
             base_url = '{}://{}'.format(url.scheme, url.netloc)
-            with requests.Session() as session:
-                session.get(base_url)
-                resp = session.get('{base_url}/{lyr}/metadata.json'.format(
-                    base_url=base_url, lyr=layer))
-                resp.raise_for_status()
+            resp = get_session().get('{base_url}/{lyr}/metadata.json'.format(
+                base_url=base_url, lyr=layer))
+            resp.raise_for_status()
             content = resp.json()
         else:
             if not isinstance(self.service_metadata_url, Path):
@@ -31,18 +31,100 @@
 """ Starlette module providing the route paths to the api"""
 
 import os
+import zlib
 
 import click
 
 from starlette.staticfiles import StaticFiles
 from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.responses import Response, StreamingResponse
 import uvicorn
 
 from pygeoapi.api import API
+from pygeoapi.openapi import load_openapi_document
 from pygeoapi.util import yaml_load
 
+# media types of responses to compress (as Flask-Compress in flask_app);
+# tiles and raw files are typically binary and/or already compressed
+COMPRESS_MIMETYPES = (
+    'application/json',
+    'application/geo+json',
+    'application/ld+json',
+    'application/vnd.oai.openapi+json',
+    'text/html'
+)
+
+
+class CompressMiddleware:
+    """
+    GZip compresses responses whose media type is one of
+    COMPRESS_MIMETYPES, passing all other responses through as is
+    """
+
+    def __init__(self, app, minimum_size=500, compresslevel=5):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope, receive, send):
+        if (scope['type'] != 'http' or
+                'gzip' not in Headers(scope=scope).get('accept-encoding', '')):
+            await self.app(scope, receive, send)
+            return
+
+        # the response start message is held back until the first body
+        # message, once it is known whether to compress the response
+        state = {'start': None, 'compressor': None}
+
+        async def send_(message):
+            if message['type'] == 'http.response.start':
+                state['start'] = message
+                return
+            elif message['type'] != 'http.response.body':
+                await send(message)
+                return
+
+            body = message.get('body', b'')
+            more_body = message.get('more_body', False)
+            start, state['start'] = state['start'], None
+
+            if start is not None:
+                headers = MutableHeaders(raw=list(start['headers']))
+                mimetype = headers.get('content-type', '').split(';')[0]
+                if all([mimetype.strip() in COMPRESS_MIMETYPES,
+                        'content-encoding' not in headers,
+                        more_body or len(body) >= self.minimum_size]):
+                    state['compressor'] = zlib.compressobj(
+                        self.compresslevel, zlib.DEFLATED,
+                        16 + zlib.MAX_WBITS)
+
+            compressor = state['compressor']
+            if compressor is not None:
+                body = compressor.compress(body)
+                if not more_body:
+                    body += compressor.flush()
+                message = dict(message, body=body)
+
+            if start is not None:
+                if compressor is not None:
+                    headers['Content-Encoding'] = 'gzip'
+                    headers.add_vary_header('Accept-Encoding')
+                    if more_body:
+                        if 'content-length' in headers:
+                            del headers['Content-Length']
+                    else:
+                        headers['Content-Length'] = str(len(body))
+                    start = dict(start, headers=headers.raw)
+                await send(start)
+
+            await send(message)
+
+        await self.app(scope, receive, send_)
+
+
 CONFIG = None
 
 if 'PYGEOAPI_CONFIG' not in os.environ:
@@ -64,6 +146,10 @@ if CONFIG['server'].get('cors', False):
     from starlette.middleware.cors import CORSMiddleware
     app.add_middleware(CORSMiddleware, allow_origins=['*'])
 
+# Compression: optionally enable from config.
+if CONFIG['server'].get('compress', False):
+    app.add_middleware(CompressMiddleware, minimum_size=500, compresslevel=5)
+
 OGC_SCHEMAS_LOCATION = CONFIG['server'].get('ogc_schemas_location', None)
 
 if (OGC_SCHEMAS_LOCATION is not None and
@@ -75,370 +161,156 @@ if (OGC_SCHEMAS_LOCATION is not None and
 api_ = API(CONFIG)
 
 
-@app.route('/')
-async def landing_page(request: Request):
-    """
-    OGC API landing page endpoint
-
-    :returns: Starlette HTTP Response
+def get_response(result):
     """
+    Creates a Starlette Response object with matching headers.
 
-    headers, status_code, content = api_.landing_page(
-        request.headers, request.query_params)
-
-    response = Response(content=content, status_code=status_code)
-    if headers:
-        response.headers.update(headers)
-
-    return response
+    Content which is not `str` or `bytes` (e.g. a generator of raw file
+    chunks) is streamed to the client as it is produced rather than
+    buffered in memory.
 
+    :param result: The result of the API call.
+                   This should be a tuple of (headers, status, content).
 
-@app.route('/openapi')
-@app.route('/openapi/')
-async def openapi(request: Request):
-    """
-    OpenAPI endpoint
-
-    :returns: Starlette HTTP Response
+    :returns: A Response instance.
     """
 
-    with open(os.environ.get('PYGEOAPI_OPENAPI'), encoding='utf8') as ff:
-        openapi = yaml_load(ff)
+    headers, status_code, content = result
 
-    headers, status_code, content = api_.openapi(
-        request.headers, request.query_params, openapi)
+    if isinstance(content, (str, bytes)):
+        return Response(content=content, status_code=status_code,
+                        headers=headers)
 
-    response = Response(content=content, status_code=status_code)
-    if headers:
-        response.headers.update(headers)
+    return StreamingResponse(content, status_code=status_code,
+                             headers=headers)
 
-    return response
 
+# OGC API endpoints which map directly onto a single API method:
+# (URL rules, API method name, path parameters passed positionally)
+ROUTES = [
+    (('/',), 'landing_page', ()),
+    (('/conformance', '/conformance/'), 'conformance', ()),
+    (('/collections', '/collections/', '/collections/{collection_id}',
+      '/collections/{collection_id}/'),
+     'describe_collections', ('collection_id',)),
+    (('/collections/{collection_id}/queryables',
+      '/collections/{collection_id}/queryables/'),
+     'get_collection_queryables', ('collection_id',)),
+    (('/collections/{collection_id}/items/{item_id}',
+      '/collections/{collection_id}/items/{item_id}/'),
+     'get_collection_item', ('collection_id', 'item_id')),
+    (('/collections/{collection_id}/coverage',),
+     'get_collection_coverage', ('collection_id',)),
+    (('/collections/{collection_id}/coverage/domainset',),
+     'get_collection_coverage_domainset', ('collection_id',)),
+    (('/collections/{collection_id}/coverage/rangetype',),
+     'get_collection_coverage_rangetype', ('collection_id',)),
+    (('/collections/{collection_id}/tiles',
+      '/collections/{collection_id}/tiles/'),
+     'get_collection_tiles', ('collection_id',)),
+    (('/collections/{collection_id}/tiles/{tileMatrixSetId}/metadata',),
+     'get_collection_tiles_metadata', ('collection_id', 'tileMatrixSetId')),
+    (('/collections/{collection_id}/tiles/{tileMatrixSetId}/{tileMatrix}/'
+      '{tileRow}/{tileCol}',),
+     'get_collection_tiles_data',
+     ('collection_id', 'tileMatrixSetId', 'tileMatrix', 'tileRow',
+      'tileCol')),
+    (('/processes', '/processes/', '/processes/{process_id}',
+      '/processes/{process_id}/'),
+     'describe_processes', ('process_id',)),
+    (('/stac',), 'get_stac_root', ()),
+    (('/stac/{path:path}',), 'get_stac_path', ('path',))
+]
 
-@app.route('/conformance')
-@app.route('/conformance/')
-async def conformance(request: Request):
-    """
-    OGC API conformance endpoint
-
-    :returns: Starlette HTTP Response
-    """
+# API methods which only serve configuration derived content, memoized
+# after the first request, and never block; these are called directly on
+# the event loop rather than being handed off to the threadpool
+NON_BLOCKING_METHODS = ('landing_page', 'conformance')
 
-    headers, status_code, content = api_.conformance(
-        request.headers, request.query_params)
 
-    response = Response(content=content, status_code=status_code)
-    if headers:
-        response.headers.update(headers)
-
-    return response
-
-
-@app.route('/collections')
-@app.route('/collections/')
-@app.route('/collections/{collection_id}')
-@app.route('/collections/{collection_id}/')
-async def collections(request: Request, collection_id=None):
+def _make_view(method_name, path_params):
     """
-    OGC API collections endpoint
+    Creates a view function dispatching to a single API method
 
-    :param collection_id: collection identifier
+    :param method_name: name of `pygeoapi.api.API` method
+    :param path_params: `tuple` of path parameter names, passed to the
+                        API method in order after headers and args
 
-    :returns: Starlette HTTP Response
+    :returns: view function
     """
 
-    if 'collection_id' in request.path_params:
-        collection_id = request.path_params['collection_id']
-    headers, status_code, content = api_.describe_collections(
-        request.headers, request.query_params, collection_id)
+    api_method = getattr(api_, method_name)
 
-    response = Response(content=content, status_code=status_code)
-    if headers:
-        response.headers.update(headers)
-
-    return response
-
-
-@app.route('/collections/{collection_id}/queryables')
-@app.route('/collections/{collection_id}/queryables/')
-async def collection_queryables(request: Request, collection_id=None):
-    """
-    OGC API collections queryables endpoint
-
-    :param collection_id: collection identifier
+    if method_name in NON_BLOCKING_METHODS:
+        async def view(request: Request):
+            return get_response(api_method(
+                request.headers, request.query_params))
+    else:
+        async def view(request: Request):
+            path_params_ = request.path_params
+            return get_response(await run_in_threadpool(
+                api_method, request.headers, request.query_params,
+                *[path_params_.get(p) for p in path_params]))
 
-    :returns: Starlette HTTP Response
-    """
+    view.__name__ = method_name
 
-    if 'collection_id' in request.path_params:
-        collection_id = request.path_params['collection_id']
-    headers, status_code, content = api_.get_collection_queryables(
-        request.headers, request.query_params, collection_id)
+    return view
 
-    response = Response(content=content, status_code=status_code)
-    if headers:
-        response.headers.update(headers)
 
-    return response
+for rules, method_name, path_params in ROUTES:
+    view_ = _make_view(method_name, path_params)
+    for rule in rules:
+        app.add_route(rule, view_)
 
 
-@app.route('/collections/{name}/tiles')
-@app.route('/collections/{name}/tiles/')
-async def get_collection_tiles(request: Request, name=None):
+@app.route('/openapi')
+@app.route('/openapi/')
+async def openapi(request: Request):
     """
-    OGC open api collections tiles access point
-
-    :param name: identifier of collection name
+    OpenAPI endpoint
 
     :returns: Starlette HTTP Response
     """
 
-    if 'name' in request.path_params:
-        name = request.path_params['name']
-    headers, status_code, content = api_.get_collection_tiles(
-        request.headers, request.query_params, name)
-
-    response = Response(content=content, status_code=status_code)
-    if headers:
-        response.headers.update(headers)
-
-    return response
-
-
-@app.route('/collections/{name}/tiles/\
-    {tileMatrixSetId}/{tile_matrix}/{tileRow}/{tileCol}')
-@app.route('/collections/{name}/tiles/\
-    {tileMatrixSetId}/{tile_matrix}/{tileRow}/{tileCol}/')
-def get_collection_items_tiles(request: Request, name=None,
-                               tileMatrixSetId=None, tile_matrix=None,
-                               tileRow=None, tileCol=None):
-    """
-    OGC open api collection tiles service
-
-    :param name: identifier of collection name
-    :param tileMatrixSetId: identifier of tile matrix set
-    :param tile_matrix: identifier of {z} matrix index
-    :param tileRow: identifier of {y} matrix index
-    :param tileCol: identifier of {x} matrix index
-
-    :returns: HTTP response
-    """
-
-    if 'name' in request.path_params:
-        name = request.path_params['name']
-    if 'tileMatrixSetId' in request.path_params:
-        tileMatrixSetId = request.path_params['tileMatrixSetId']
-    if 'tile_matrix' in request.path_params:
-        tile_matrix = request.path_params['tile_matrix']
-    if 'tileRow' in request.path_params:
-        tileRow = request.path_params['tileRow']
-    if 'tileCol' in request.path_params:
-        tileCol = request.path_params['tileCol']
-    headers, status_code, content = api_.get_collection_items_tiles(
-        request.headers, request.query_params, name, tileMatrixSetId,
-        tile_matrix, tileRow, tileCol)
+    openapi = await run_in_threadpool(
+        load_openapi_document, os.environ.get('PYGEOAPI_OPENAPI'))
 
-    response = Response(content=content, status_code=status_code)
-    if headers:
-        response.headers.update(headers)
-
-    return response
+    return get_response(await run_in_threadpool(
+        api_.openapi, request.headers, request.query_params, openapi))
 
 
 @app.route('/collections/{collection_id}/items')
 @app.route('/collections/{collection_id}/items/')
-@app.route('/collections/{collection_id}/items/{item_id}')
-@app.route('/collections/{collection_id}/items/{item_id}/')
-async def collection_items(request: Request, collection_id=None, item_id=None):
+async def collection_items(request: Request):
     """
     OGC API collections items endpoint
 
-    :param collection_id: collection identifier
-    :param item_id: item identifier
-
-    :returns: Starlette HTTP Response
-    """
-
-    if 'collection_id' in request.path_params:
-        collection_id = request.path_params['collection_id']
-    if 'item_id' in request.path_params:
-        item_id = request.path_params['item_id']
-    if item_id is None:
-        headers, status_code, content = api_.get_collection_items(
-            request.headers, request.query_params,
-            collection_id, pathinfo=request.scope['path'])
-    else:
-        headers, status_code, content = api_.get_collection_item(
-            request.headers, request.query_params, collection_id, item_id)
-
-    response = Response(content=content, status_code=status_code)
-
-    if headers:
-        response.headers.update(headers)
-
-    return response
-
-
-@app.route('/collections/{collection_id}/coverage')
-def collection_coverage(request: Request, collection_id):
-    """
-    OGC API - Coverages coverage endpoint
-
-    :param collection_id: collection identifier
-
-    :returns: Starlette HTTP Response
-    """
-
-    if 'collection_id' in request.path_params:
-        collection_id = request.path_params['collection_id']
-
-    headers, status_code, content = api_.get_collection_coverage(
-        request.headers, request.query_params, collection_id)
-
-    response = Response(content=content, status_code=status_code)
-
-    if headers:
-        response.headers.update(headers)
-
-    return response
-
-
-@app.route('/collections/{collection_id}/coverage/domainset')
-def collection_coverage_domainset(request: Request, collection_id):
-    """
-    OGC API - Coverages coverage domainset endpoint
-
-    :param collection_id: collection identifier
-
-    :returns: Starlette HTTP Response
-    """
-
-    if 'collection_id' in request.path_params:
-        collection_id = request.path_params['collection_id']
-
-    headers, status_code, content = api_.get_collection_coverage_domainset(
-        request.headers, request.query_params, collection_id)
-
-    response = Response(content=content, status_code=status_code)
-
-    if headers:
-        response.headers.update(headers)
-
-    return response
-
-
-@app.route('/collections/{collection_id}/coverage/rangetype')
-def collection_coverage_rangetype(request: Request, collection_id):
-    """
-    OGC API - Coverages coverage rangetype endpoint
-
-    :param collection_id: collection identifier
-
-    :returns: Starlette HTTP Response
-    """
-
-    if 'collection_id' in request.path_params:
-        collection_id = request.path_params['collection_id']
-
-    headers, status_code, content = api_.get_collection_coverage_rangetype(
-        request.headers, request.query_params, collection_id)
-
-    response = Response(content=content, status_code=status_code)
-
-    if headers:
-        response.headers.update(headers)
-
-    return response
-
-
-@app.route('/processes')
-@app.route('/processes/')
-@app.route('/processes/{process_id}')
-@app.route('/processes/{process_id}/')
-async def processes(request: Request, process_id=None):
-    """
-    OGC API - Processes description endpoint
-
-    :param process_id: identifier of process to describe
-
     :returns: Starlette HTTP Response
     """
-    headers, status_code, content = api_.describe_processes(
-        request.headers, request.query_params, process_id)
-
-    response = Response(content=content, status_code=status_code)
 
-    if headers:
-        response.headers.update(headers)
-
-    return response
+    return get_response(await run_in_threadpool(
+        api_.get_collection_items, request.headers, request.query_params,
+        request.path_params['collection_id'], pathinfo=request.scope['path']))
 
 
 @app.route('/processes/{process_id}/jobs', methods=['GET', 'POST'])
 @app.route('/processes/{process_id}/jobs/', methods=['GET', 'POST'])
-async def process_jobs(request: Request, process_id=None):
+async def process_jobs(request: Request):
     """
     OGC API - Processes jobs endpoint
 
-    :param process_id: identifier of process to execute
-
     :returns: Starlette HTTP Response
     """
 
-    if request.method == 'GET':
-        headers, status_code, content = ({}, 200, "[]")
-    elif request.method == 'POST':
-        headers, status_code, content = api_.execute_process(
-            request.headers, request.query_params, request.data, process_id)
-
-    response = Response(content=content, status_code=status_code)
-
-    if headers:
-        response.headers.update(headers)
-
-    return response
-
-
-@app.route('/stac')
-async def stac_catalog_root(request: Request):
-    """
-    STAC root endpoint
-
-    :returns: Starlette HTTP response
-    """
-
-    headers, status_code, content = api_.get_stac_root(
-        request.headers, request.query_params)
-
-    response = Response(content=content, status_code=status_code)
-
-    if headers:
-        response.headers.update(headers)
-
-    return response
-
-
-@app.route('/stac/{path:path}')
-async def stac_catalog_path(request: Request):
-    """
-    STAC endpoint
-
-    :param path: path
-
-    :returns: Starlette HTTP response
-    """
-
-    path = request.path_params["path"]
-
-    headers, status_code, content = api_.get_stac_path(
-        request.headers, request.query_params, path)
-
-    response = Response(content=content, status_code=status_code)
-
-    if headers:
-        response.headers.update(headers)
+    method = request.method
 
-    return response
+    if method == 'GET':
+        return get_response(({}, 200, "[]"))
+    elif method == 'POST':
+        data = await request.body()
+        return get_response(await run_in_threadpool(
+            api_.execute_process, request.headers, request.query_params,
+            data, request.path_params['process_id']))
 
 
 @click.command()
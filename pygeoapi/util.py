@@ -32,6 +32,7 @@
 import base64
 from datetime import date, datetime, time
 from decimal import Decimal
+from functools import lru_cache
 import io
 import json
 import logging
@@ -44,6 +45,16 @@ from urllib.parse import urlparse
 from jinja2 import Environment, FileSystemLoader
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from pygeoapi import __version__
 from pygeoapi.provider.base import ProviderTypeError
 
@@ -97,6 +108,26 @@ def get_typed_value(value):
     return value2
 
 
+# support environment variables in config
+# https://stackoverflow.com/a/55301129
+PATH_MATCHER = re.compile(r'.*\$\{([^}^{]+)\}.*')
+
+
+def _path_constructor(loader, node):
+    env_var = PATH_MATCHER.match(node.value).group(1)
+    if env_var not in os.environ:
+        raise EnvironmentError('Undefined environment variable in config')
+    return get_typed_value(os.path.expandvars(node.value))
+
+
+class EnvVarLoader(SafeLoader):
+    pass
+
+
+EnvVarLoader.add_implicit_resolver('!path', PATH_MATCHER, None)
+EnvVarLoader.add_constructor('!path', _path_constructor)
+
+
 def yaml_load(fh):
     """
     serializes a YAML files into a pyyaml object
@@ -106,22 +137,6 @@ def yaml_load(fh):
     :returns: `dict` representation of YAML
     """
 
-    # support environment variables in config
-    # https://stackoverflow.com/a/55301129
-    path_matcher = re.compile(r'.*\$\{([^}^{]+)\}.*')
-
-    def path_constructor(loader, node):
-        env_var = path_matcher.match(node.value).group(1)
-        if env_var not in os.environ:
-            raise EnvironmentError('Undefined environment variable in config')
-        return get_typed_value(os.path.expandvars(node.value))
-
-    class EnvVarLoader(yaml.SafeLoader):
-        pass
-
-    EnvVarLoader.add_implicit_resolver('!path', path_matcher, None)
-    EnvVarLoader.add_constructor('!path', path_constructor)
-
     return yaml.load(fh, Loader=EnvVarLoader)
 
 
@@ -149,6 +164,11 @@ def to_json(dict_, pretty=False):
     """
     Serialize dict to json
 
+    Compact output is serialized with orjson, falling back to the
+    standard library json module when orjson is not available or cannot
+    serialize the object (e.g. integers wider than 64 bits).  Note that
+    orjson serializes NaN and Infinity as null.
+
     :param dict_: `dict` of JSON representation
     :param pretty: `bool` of whether to prettify JSON (default is `False`)
 
@@ -156,12 +176,20 @@ def to_json(dict_, pretty=False):
     """
 
     if pretty:
-        indent = 4
-    else:
-        indent = None
+        return json.dumps(dict_, default=json_serial, indent=4)
+
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                dict_, default=json_serial,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            ).decode('utf-8')
+        except orjson.JSONEncodeError as err:
+            LOGGER.debug('orjson failed, using json: {}'.format(err))
 
-    return json.dumps(dict_, default=json_serial,
-                      indent=indent)
+    # same (compact, UTF-8) formatting as orjson
+    return json.dumps(dict_, default=json_serial, ensure_ascii=False,
+                      separators=(',', ':'))
 
 
 def get_path_basename(urlpath):
@@ -192,7 +220,7 @@ def json_serial(obj):
             return obj.decode('utf-8')
         except UnicodeDecodeError:
             LOGGER.debug('Returning as base64 encoded JSON object')
-            return base64.b64encode(obj)
+            return base64.b64encode(obj).decode('utf-8')
     elif isinstance(obj, Decimal):
         return float(obj)
 
@@ -229,12 +257,28 @@ def render_j2_template(config, template, data):
 
     try:
         templates_path = config['server']['templates']['path']
-        env = Environment(loader=FileSystemLoader(templates_path))
         LOGGER.debug('using custom templates: {}'.format(templates_path))
     except (KeyError, TypeError):
-        env = Environment(loader=FileSystemLoader(TEMPLATES))
+        templates_path = TEMPLATES
         LOGGER.debug('using default templates: {}'.format(TEMPLATES))
 
+    template = _get_j2_environment(templates_path).get_template(template)
+    return template.render(config=config, data=data, version=__version__)
+
+
+@lru_cache(maxsize=None)
+def _get_j2_environment(templates_path):
+    """
+    get (and cache) the Jinja2 environment of a templates directory, so
+    that templates are only loaded and compiled once
+
+    :param templates_path: path to templates directory
+
+    :returns: `jinja2.Environment` object
+    """
+
+    env = Environment(loader=FileSystemLoader(templates_path))
+
     env.filters['to_json'] = to_json
     env.globals.update(to_json=to_json)
 
@@ -247,10 +291,10 @@ def render_j2_template(config, template, data):
     env.filters['filter_dict_by_key_value'] = filter_dict_by_key_value
     env.globals.update(filter_dict_by_key_value=filter_dict_by_key_value)
 
-    template = env.get_template(template)
-    return template.render(config=config, data=data, version=__version__)
+    return env
 
 
+@lru_cache(maxsize=256)
 def get_mimetype(filename):
     """
     helper function to return MIME type of a given file
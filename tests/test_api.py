@@ -37,7 +37,8 @@ from werkzeug.test import create_environ
 from werkzeug.wrappers import Request
 
 from pygeoapi.api import API, check_format, validate_bbox, validate_datetime
-from pygeoapi.util import yaml_load
+from pygeoapi.provider.mvt import MVTProvider
+from pygeoapi.util import render_j2_template, to_json, yaml_load
 
 LOGGER = logging.getLogger(__name__)
 
@@ -84,6 +85,22 @@ def api_(config):
     return API(config)
 
 
+@pytest.fixture()
+def rendered_templates(monkeypatch):
+    """list of Jinja2 templates rendered by the API during a test"""
+
+    templates = []
+
+    def counting_render_j2_template(config, template, data):
+        templates.append(template)
+        return render_j2_template(config, template, data)
+
+    monkeypatch.setattr('pygeoapi.api.render_j2_template',
+                        counting_render_j2_template)
+
+    return templates
+
+
 def test_api(config, api_, openapi):
     assert api_.config == config
     assert isinstance(api_.config, dict)
@@ -107,6 +124,44 @@ def test_api(config, api_, openapi):
     assert code == 400
 
 
+def test_openapi_html_memoized(config, api_, openapi, rendered_templates):
+    req_headers = make_req_headers()
+    rsp_headers, code, response = api_.openapi(req_headers, {'f': 'html'},
+                                               openapi)
+    assert rsp_headers['Content-Type'] == 'text/html'
+
+    rsp_headers, code, response2 = api_.openapi(req_headers, {'f': 'html'},
+                                                openapi)
+    assert rsp_headers['Content-Type'] == 'text/html'
+    assert response2 == response
+    assert rendered_templates == ['openapi.html']
+
+
+def test_root_memoized(config, api_, rendered_templates, monkeypatch):
+    serialized = []
+
+    def counting_to_json(dict_, pretty=False):
+        serialized.append(dict_)
+        return to_json(dict_, pretty)
+
+    monkeypatch.setattr('pygeoapi.api.to_json', counting_to_json)
+
+    req_headers = make_req_headers()
+    for i in range(2):
+        rsp_headers, code, response = api_.landing_page(req_headers,
+                                                        {'f': 'json'})
+        assert rsp_headers['Content-Type'] == 'application/json'
+        assert 'links' in json.loads(response)
+
+        rsp_headers, code, response = api_.landing_page(req_headers,
+                                                        {'f': 'html'})
+        assert rsp_headers['Content-Type'] == 'text/html'
+        assert response.startswith('<!doctype html>')
+
+    assert len(serialized) == 1
+    assert rendered_templates == ['landing_page.html']
+
+
 def test_api_exception(config, api_):
     req_headers = make_req_headers()
     rsp_headers, code, response = api_.landing_page(req_headers, {'f': 'foo'})
@@ -186,6 +241,17 @@ def test_conformance(config, api_):
     assert rsp_headers['Content-Type'] == 'text/html'
 
 
+def test_conformance_html_memoized(config, api_, rendered_templates):
+    req_headers = make_req_headers()
+    rsp_headers, code, response = api_.conformance(req_headers, {'f': 'html'})
+    assert rsp_headers['Content-Type'] == 'text/html'
+
+    rsp_headers, code, response2 = api_.conformance(req_headers, {'f': 'html'})
+    assert rsp_headers['Content-Type'] == 'text/html'
+    assert response2 == response
+    assert rendered_templates == ['conformance.html']
+
+
 def test_describe_collections(config, api_):
     req_headers = make_req_headers()
     rsp_headers, code, response = api_.describe_collections(
@@ -711,6 +777,69 @@ def test_get_collection_tiles(config, api_):
     assert code == 200
 
 
+def test_get_collection_tiles_metadata(config, api_, monkeypatch):
+    calls = []
+    get_metadata = MVTProvider.get_metadata
+
+    def counting_get_metadata(self, *args, **kwargs):
+        calls.append(args)
+        return get_metadata(self, *args, **kwargs)
+
+    monkeypatch.setattr(MVTProvider, 'get_metadata', counting_get_metadata)
+
+    req_headers = make_lakes_req_headers()
+    rsp_headers, code, response = api_.get_collection_tiles_metadata(
+        req_headers, {}, 'lakes', 'foo')
+
+    assert code == 404
+
+    rsp_headers, code, response = api_.get_collection_tiles_metadata(
+        req_headers, {}, 'lakes', 'WorldCRS84Quad')
+
+    assert code == 200
+    assert len(calls) == 1
+
+    rsp_headers, code, response2 = api_.get_collection_tiles_metadata(
+        req_headers, {}, 'lakes', 'WorldCRS84Quad')
+
+    assert code == 200
+    assert response2 == response
+    assert len(calls) == 1
+
+
+def test_get_collection_tiles_data(config, api_):
+    req_headers = make_lakes_req_headers()
+    rsp_headers, code, response = api_.get_collection_tiles_data(
+        req_headers, {}, 'lakes', 'WorldCRS84Quad', '3', '2', '2')
+
+    # a cacheable status, which clients revalidate with the ETag
+    assert code == 200
+    assert len(response) > 0
+    assert 'ETag' in rsp_headers
+
+    etag = rsp_headers['ETag']
+    req_headers = make_lakes_req_headers(HTTP_IF_NONE_MATCH=etag)
+    rsp_headers, code, response = api_.get_collection_tiles_data(
+        req_headers, {}, 'lakes', 'WorldCRS84Quad', '3', '2', '2')
+
+    assert code == 304
+    assert response == b''
+
+    req_headers = make_lakes_req_headers(HTTP_IF_NONE_MATCH='*')
+    rsp_headers, code, response = api_.get_collection_tiles_data(
+        req_headers, {}, 'lakes', 'WorldCRS84Quad', '3', '2', '2')
+
+    assert code == 304
+    assert response == b''
+
+    req_headers = make_lakes_req_headers(HTTP_IF_NONE_MATCH='"foo"')
+    rsp_headers, code, response = api_.get_collection_tiles_data(
+        req_headers, {}, 'lakes', 'WorldCRS84Quad', '3', '2', '2')
+
+    assert code == 200
+    assert rsp_headers['ETag'] == etag
+
+
 def test_describe_processes(config, api_):
     req_headers = make_req_headers()
     rsp_headers, code, response = api_.describe_processes(
@@ -850,6 +979,24 @@ def test_check_format():
     req_headers = make_req_headers(HTTP_ACCEPT='application/ld+json')
     assert check_format({}, req_headers) == 'jsonld'
 
+    hh = 'application/geo+json, application/json; charset=utf-8'
+    req_headers = make_req_headers(HTTP_ACCEPT=hh)
+    assert check_format({}, req_headers) == 'json'
+
+    req_headers = make_req_headers(HTTP_ACCEPT='image/png')
+    assert check_format({}, req_headers) is None
+
+    hh = 'text/html;q=0.1, application/json;q=0.9'
+    req_headers = make_req_headers(HTTP_ACCEPT=hh)
+    assert check_format({}, req_headers) == 'json'
+
+    hh = 'application/json, text/html'
+    req_headers = make_req_headers(HTTP_ACCEPT=hh)
+    assert check_format({}, req_headers) == 'html'
+
+    req_headers = make_req_headers(HTTP_ACCEPT='text/html;q=0')
+    assert check_format({}, req_headers) is None
+
     # Overrule HTTP content negotiation
     args['f'] = 'html'
     assert check_format(args, req_headers) == 'html'
@@ -30,6 +30,7 @@
 import os
 import pytest
 
+from pygeoapi.provider.base import ProviderNotFoundError
 from pygeoapi.provider.filesystem import FileSystemProvider
 
 THISDIR = os.path.dirname(os.path.realpath(__file__))
@@ -59,3 +60,25 @@ def test_query(config):
     r = p.get_data_path(baseurl, urlpath, '/poi_portugal')
     assert r['geometry']['type'] == 'Polygon'
     assert r['assets']['default']['href'] == 'http://example.org/stac/poi_portugal.gpkg'  # noqa
+
+
+def test_query_raw_file(config):
+    p = FileSystemProvider(config)
+
+    baseurl = 'http://example.org/stac'
+    urlpath = 'poi_portugal.gpkg'
+
+    r = p.get_data_path(baseurl, urlpath, '/poi_portugal.gpkg')
+
+    with open(os.path.join(THISDIR, 'data', 'poi_portugal.gpkg'), 'rb') as fh:
+        assert b''.join(r) == fh.read()
+
+
+def test_query_raw_file_not_found(config):
+    p = FileSystemProvider(config)
+
+    baseurl = 'http://example.org/stac'
+    urlpath = 'foo.gpkg'
+
+    with pytest.raises(ProviderNotFoundError):
+        p.get_data_path(baseurl, urlpath, '/foo.gpkg')
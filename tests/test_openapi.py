@@ -27,7 +27,11 @@
 #
 # =================================================================
 
-from pygeoapi.openapi import get_ogc_schemas_location
+import os
+
+from pygeoapi.openapi import get_ogc_schemas_location, load_openapi_document
+
+THISDIR = os.path.dirname(os.path.realpath(__file__))
 
 
 def test_str2bool():
@@ -45,3 +49,28 @@ def test_str2bool():
 
     default['ogc_schemas_location'] = '/opt/schemas.opengis.net'
     osl = get_ogc_schemas_location(default)
+
+
+def test_load_openapi_document():
+    filepath = os.path.join(THISDIR, 'pygeoapi-test-openapi.yml')
+
+    oas = load_openapi_document(filepath)
+    assert isinstance(oas, dict)
+    assert 'paths' in oas
+
+    assert load_openapi_document(filepath) is oas
+
+
+def test_load_openapi_document_modified(tmp_path):
+    filepath = tmp_path / 'openapi.yml'
+    filepath.write_text('openapi: 3.0.2\n')
+    os.utime(filepath, (1000000000, 1000000000))
+
+    oas = load_openapi_document(str(filepath))
+    assert oas == {'openapi': '3.0.2'}
+
+    filepath.write_text('openapi: 3.0.3\n')
+    os.utime(filepath, (1000000001, 1000000001))
+
+    oas = load_openapi_document(str(filepath))
+    assert oas == {'openapi': '3.0.3'}
@@ -29,6 +29,7 @@
 
 from datetime import datetime, date, time
 from decimal import Decimal
+import json
 import os
 
 import pytest
@@ -103,6 +104,10 @@ def test_mimetype():
     assert util.get_mimetype('file.xml') == 'application/xml'
     assert util.get_mimetype('file.yml') == 'text/plain'
     assert util.get_mimetype('file.yaml') == 'text/plain'
+    assert util.get_mimetype('schemas/core.json') == 'application/json'
+    assert util.get_mimetype('file') is None
+    assert util.get_mimetype('file.tar.gz') == 'application/x-tar'
+    assert util.get_mimetype('data.csv.gz') == 'text/csv'
 
 
 def test_get_breadcrumbs():
@@ -113,6 +118,64 @@ def test_get_breadcrumbs():
     assert breadcrumbs[3]['href'] == 'dataset/model-run/forecast-hour'
 
 
+def test_to_json():
+    d = {
+        'date': date(2010, 7, 31),
+        'decimal': Decimal(1.5),
+        1: 'non-string key'
+    }
+
+    assert json.loads(util.to_json(d)) == {
+        'date': '2010-07-31',
+        'decimal': 1.5,
+        '1': 'non-string key'
+    }
+
+    assert util.to_json(d, pretty=True).startswith('{\n    "date"')
+
+    # integers wider than 64 bits are not supported by orjson
+    assert util.to_json({'id': 2 ** 64}) == '{"id":18446744073709551616}'
+
+    # orjson serializes NaN as null
+    assert util.to_json({'value': float('nan')}) == '{"value":null}'
+
+
+def test_to_json_without_orjson(monkeypatch):
+    monkeypatch.setattr(util, 'orjson', None)
+
+    d = {
+        'date': date(2010, 7, 31),
+        'decimal': Decimal(1.5),
+        1: 'non-string key'
+    }
+
+    assert json.loads(util.to_json(d)) == {
+        'date': '2010-07-31',
+        'decimal': 1.5,
+        '1': 'non-string key'
+    }
+
+    assert util.to_json({'id': 2 ** 64}) == '{"id":18446744073709551616}'
+
+    # the json module serializes NaN as is
+    assert util.to_json({'value': float('nan')}) == '{"value":NaN}'
+
+
+def test_to_json_formatting(monkeypatch):
+    d = {
+        'id': 1,
+        'name': 'Lisboa',
+        'description': 'Município de Lisboa',
+        'coordinates': [-9.139, 38.722],
+        'properties': {'valid': True, 'value': None}
+    }
+
+    with_orjson = util.to_json(d)
+
+    monkeypatch.setattr(util, 'orjson', None)
+    assert util.to_json(d) == with_orjson
+
+
 def test_path_basename():
     assert util.get_path_basename('/path/to/file.txt') == 'file.txt'
     assert util.get_path_basename('/path/to/dir') == 'dir'